@@ -18,30 +18,89 @@ MCPとは「Model Context Protocol」の略で、AIモデル（このケース
 
 # 必要なライブラリのインポート
 from mcp.server.fastmcp import FastMCP  # MCPサーバーを作成するためのメインライブラリ
+import anyio  # mcpが使用する非同期ライブラリ（終了処理をキャンセルから保護するため）
 import time
 import signal
+import asyncio
 import sys
-import datetime
+import codecs
+import queue
+import mmap
+import errno
 import os
 import logging
-import re
+import logging.handlers
+import atexit
+import string
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, List, Tuple, AsyncIterator
+
+# io_uringバインディング（オプション） - Linuxでliburingパッケージがインストールされている場合のみ使用
+# インストールされていない環境ではos.open/os.writeによる通常の書き込みにフォールバックする
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+# 一度だけ実行すればよい初期化処理（ロギング設定、シグナル登録など）を行うかどうか
+# モジュールの再読み込み（リローダーなど）ではグローバル変数が引き継がれるため、
+# 同じプロセスで初期化済みであれば再実行しない。fork後の子プロセスでは改めて初期化する
+_FIRST_INIT = globals().get('_INITIALIZED') != os.getpid()
+
+# キャッシュの利用状況の統計 - get_cache_statsツールで確認できる（再読み込み後も引き継ぐ）
+_CACHE_STATS: Dict[str, int] = globals().get('_CACHE_STATS') or {
+    "mcp_instance_hits": 0,      # キャッシュされたFastMCPインスタンスを再利用した回数
+    "plain_filename_hits": 0,    # ファイル名が検証に通り、サニタイズを省略した回数
+    "buffer_pool_hits": 0,       # プールのエンコード用バッファを再利用した回数
+    "buffer_pool_misses": 0,     # プールが空でバッファを新しく確保した回数
+}
 
 # ロギングの設定 - サーバーの状態とデバッグ情報を記録するために使用
-logging.basicConfig(
-    level=logging.INFO,  # INFO以上のログレベルを表示
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',  # タイムスタンプ、ロガー名、レベル、メッセージを含むログフォーマット
-    handlers=[logging.StreamHandler()]  # 標準出力にログを出力
-)
+# ログはキューに追加するだけにし、実際の出力はバックグラウンドスレッドのQueueListenerが行う
+# これにより、リクエスト処理中のログ出力がstderrへの書き込みでブロックされない
+if _FIRST_INIT:
+    # fork後の子プロセスでは、ルートロガーに引き継がれたQueueHandlerが既存のキューに書き込み続けるため、
+    # 同じキューを使用し、子プロセスには存在しない親のリスナースレッドの代わりに新しいリスナーを起動する
+    _log_queue: "queue.SimpleQueue[logging.LogRecord]" = globals().get('_log_queue')
+    if _log_queue is None:
+        _log_queue = queue.SimpleQueue()
+        logging.basicConfig(
+            level=logging.INFO,  # INFO以上のログレベルを表示
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',  # タイムスタンプ、ロガー名、レベル、メッセージを含むログフォーマット
+            handlers=[logging.handlers.QueueHandler(_log_queue)]  # ログをキューに追加（整形はここで行われる）
+        )
+    else:
+        # 親プロセスから引き継いだリスナーの停止処理は不要なため登録を解除する
+        atexit.unregister(globals()['_log_listener'].stop)
+    # 整形済みのメッセージをキューから取り出して標準エラー出力に書き込むリスナー
+    _log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+    _log_listener.start()
+    # プロセス終了時にキューに残ったログを出力してからリスナーを停止する
+    atexit.register(_log_listener.stop)
 logger = logging.getLogger("text-saver-mcp")  # このアプリケーション用のロガーを作成
 
 # グローバル設定
 MAX_TEXT_SIZE = 10 * 1024 * 1024  # 10MBの最大ファイルサイズ制限（バイト単位）
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))  # スクリプトが配置されているディレクトリの絶対パス
+_CWD = os.getcwd()  # 起動時の作業ディレクトリ（stdioで動作するMCPサーバーでは実行中に変わらない）
 ALLOWED_SAVE_DIR = SCRIPT_DIR  # テキストファイル保存を許可するディレクトリ（デフォルトはスクリプトのディレクトリ）
-# 安全なファイル名のパターン - 英数字で始まり、英数字、アンダースコア、ハイフン、ドットのみを含む
-SAFE_FILENAME_PATTERN = re.compile(r'^[a-zA-Z0-9][a-zA-Z0-9_\-\.]*$')
+_SAVE_DIR = Path(ALLOWED_SAVE_DIR)  # 保存ディレクトリのPathオブジェクト（呼び出しごとに作成しないようキャッシュ）
+_SAVE_DIR_STR = str(_SAVE_DIR.resolve())  # 保存ディレクトリの絶対パス文字列（パス結合とabspathを省略するため）
+MAX_BATCH = 32  # 1回の送信でまとめて書き込む最大ファイル数
+_URING_MIN_BATCH = 3  # io_uringで書き込む最小ファイル数（これより少ない場合は送信のオーバーヘッドの方が大きい）
+_BATCH_WINDOW = 0.001  # 同時に届いた書き込み要求をまとめるために待機する秒数（1ミリ秒）
+_BUFFER_POOL_SIZE = 4  # プールに保持するエンコード用バッファの最大数
+_ENCODE_CHUNK = 64 * 1024  # 一度にエンコードする文字数（一時的なbytesオブジェクトを小さく保つため）
+_DIRECT_IO_THRESHOLD = 1 << 20  # この大きさ（1MB）以上の保存ではO_DIRECTでページキャッシュを経由せずに書き込む
+_DIRECT_IO_ALIGN = 4096  # O_DIRECTで必要なバッファアドレスと書き込み長のアライメント（バイト）
+# ファイル名に使用できる文字の集合 - 安全なファイル名は英数字で始まり、英数字、アンダースコア、ハイフン、ドットのみを含む
+_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + '_-.')
+# サニタイズ用の256バイトの変換テーブル - 安全でないバイトをすべてアンダースコアに置き換える
+_SANITIZE_TABLE = bytes(b if chr(b) in _SAFE_CHARS else ord('_') for b in range(256))
+# 検証用の許可バイト列 - bytes.translateの削除対象として使用する
+_ALLOWED_BYTES = ''.join(sorted(_SAFE_CHARS)).encode('ascii')
 
 # カスタム例外クラス - エラー処理とデバッグを容易にするため
 class TextSaverError(Exception):
@@ -70,8 +129,9 @@ def signal_handler(sig, frame):
     sys.exit(0)  # クリーンな終了コードでプログラムを終了
 
 # シグナルハンドラの登録 - OS終了シグナルを適切に処理するため
-signal.signal(signal.SIGINT, signal_handler)   # Ctrl+Cの処理
-signal.signal(signal.SIGTERM, signal_handler)  # 終了シグナルの処理
+if _FIRST_INIT:
+    signal.signal(signal.SIGINT, signal_handler)   # Ctrl+Cの処理
+    signal.signal(signal.SIGTERM, signal_handler)  # 終了シグナルの処理
 
 def validate_filename(filename: str) -> bool:
     """
@@ -86,12 +146,14 @@ def validate_filename(filename: str) -> bool:
     戻り値:
         bool: ファイル名が安全な場合はTrue、安全でない場合はFalse
     """
-    # パストラバーサル攻撃のチェック - 絶対パスや親ディレクトリの参照を防止
-    if os.path.isabs(filename) or '..' in filename or '/' in filename or '\\' in filename:
-        return False
-        
-    # ファイル名が安全なパターンに一致するかチェック - 許可された文字のみを含むことを確認
-    return bool(SAFE_FILENAME_PATTERN.match(filename))
+    # ASCII以外の文字を含むファイル名は許可しない
+    b = filename.encode('ascii') if filename.isascii() else b''
+    
+    # 英数字で始まり、許可された文字をすべて削除して何も残らなければ安全
+    # 区切り文字（'/'や'\\'）は許可されていないため、絶対パスもここで拒否される
+    # '..'は区切り文字と組み合わせなければ親ディレクトリを参照できず、先頭も英数字に限られるため、
+    # 個別のチェックは不要（正規表現と複数の部分文字列チェックを、C実装による1回の走査にまとめている）
+    return b[:1].isalnum() and not b.translate(None, _ALLOWED_BYTES)
 
 def sanitize_path(filename: str) -> str:
     """
@@ -99,6 +161,7 @@ def sanitize_path(filename: str) -> str:
     
     この関数は、validate_filenameで検証に失敗したファイル名を安全な形式に変換します。
     パス成分を削除し、危険な文字をアンダースコアに置き換えます。
+    戻り値は常にvalidate_filenameの検証に通ります。
     
     引数:
         filename: サニタイズするファイル名
@@ -109,30 +172,627 @@ def sanitize_path(filename: str) -> str:
     # パスなしの基本ファイル名を取得 - パス成分を取り除く
     base_filename = os.path.basename(filename)
     
+    # ASCII以外の文字は1文字につき1つの'?'に置き換えてバイト列にする（'?'は下でアンダースコアになる）
+    encoded = base_filename.encode('ascii', 'replace')
+    
     # 安全でない文字をアンダースコアに置き換える
-    # 各文字が安全なパターンに一致する場合はそのまま使用し、そうでない場合は'_'に置き換える
-    safe_filename = ''.join(c if SAFE_FILENAME_PATTERN.match(c) else '_' for c in base_filename)
+    # 文字ごとに正規表現を実行せず、256バイトの変換テーブルで一括置換する（C実装のため高速）
+    safe_filename = encoded.translate(_SANITIZE_TABLE).decode('ascii')
     
     # サニタイズ後にファイル名が空の場合はデフォルトを使用
     if not safe_filename:
         safe_filename = "file.txt"
+    
+    # 先頭が英数字でない場合（'.bashrc'のような隠しファイルや'..'など）は先頭の文字をアンダースコアに置き換え、
+    # 英数字で始まるよう'file'を前に付ける（例: '.bashrc' -> 'file_bashrc'）
+    elif not safe_filename[:1].isalnum():
+        safe_filename = "file_" + safe_filename[1:]
         
     return safe_filename
 
+def _ensure_save_dir() -> None:
+    """
+    保存ディレクトリが存在することを確認し、存在しない場合は作成します。
+    
+    サーバーの起動時（_lifespan）に一度だけ呼び出され、保存のたびには
+    stat/mkdirのシステムコールを発行しません。
+    """
+    _SAVE_DIR.mkdir(parents=True, exist_ok=True)
+
+class UringWriter:
+    """
+    io_uringを使用してファイルのopen・write・closeをまとめて送信するライタ
+    
+    ファイルごとに3つの操作をリンクされたSQE（Submission Queue Entry）のチェーンとして準備し、
+    複数ファイル分のチェーンを1回のio_uring_submit_and_waitで一括送信します。
+    ファイルは固定ファイルテーブルのスロットに直接オープンされるため、
+    writeとcloseはそのスロットを参照します。
+    """
+    
+    def __init__(self, max_batch: int = MAX_BATCH):
+        """
+        リングを初期化し、固定ファイル用のスロットを登録します。
+        
+        引数:
+            max_batch: 1回の送信でまとめて書き込む最大ファイル数
+        """
+        self.max_batch = max_batch
+        self._ring = liburing.Ring()
+        self._cqe = liburing.Cqe()
+        # リングは1つしかないため、複数スレッドからの同時使用を防ぐ
+        self._lock = threading.Lock()
+        # 1ファイルあたり3エントリ（open・write・close）を使用する
+        liburing.io_uring_queue_init(max_batch * 3, self._ring, 0)
+        try:
+            liburing.io_uring_register_files_sparse(self._ring, max_batch)
+        except Exception:
+            liburing.io_uring_queue_exit(self._ring)
+            raise
+    
+    def write_batch(self, batch: List[Tuple[str, bytes]]) -> List[Union[int, OSError]]:
+        """
+        複数のファイルを1回の送信でまとめて書き込みます（既存のファイルは上書きされます）。
+        
+        引数:
+            batch: (書き込み先ファイルの絶対パス, 書き込むバイト列) のリスト（最大max_batch件）
+            
+        戻り値:
+            List[Union[int, OSError]]: batchと同じ順序の結果。成功した場合は書き込まれたバイト数、
+                                       失敗した場合はerrnoに応じたOSError
+        """
+        ring = self._ring
+        count = len(batch)
+        # 各ファイルの[open, write, close]の結果
+        results = [[0, 0, 0] for _ in range(count)]
+        # iovecは送信した書き込みが完了するまで参照を保持しておく必要がある
+        iovs = []
+        with self._lock:
+            for slot, (path, data) in enumerate(batch):
+                # 1. openat: ファイルごとの固定ファイルスロットに直接オープン
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_open_direct(sqe, path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                                                   slot, 0o666)
+                sqe.flags |= liburing.IOSQE_IO_LINK
+                sqe.user_data = slot * 3
+                # 2. write: オープンされたスロットに書き込み
+                sqe = liburing.io_uring_get_sqe(ring)
+                # プールのバッファの一部（memoryview）も書き込めるようiovec経由で渡す
+                iov = liburing.Iovec([data])
+                iovs.append(iov)
+                liburing.io_uring_prep_writev(sqe, slot, iov, 0)
+                sqe.flags |= liburing.IOSQE_IO_LINK | liburing.IOSQE_FIXED_FILE
+                sqe.user_data = slot * 3 + 1
+                # 3. close: スロットを閉じる
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_close_direct(sqe, slot)
+                sqe.user_data = slot * 3 + 2
+            
+            # すべてのチェーンを1回のio_uring_enterで送信し、すべての完了を待つ
+            # 異なるチェーンの完了順序は保証されないため、user_dataで結果を振り分ける
+            # CQEは1件ずつ取り出して消費する（完了キューの折り返しを正しく扱うため）
+            total = count * 3
+            liburing.io_uring_submit_and_wait(ring, total)
+            for _ in range(total):
+                liburing.io_uring_wait_cqe(ring, self._cqe)
+                entry = self._cqe[0]
+                slot, op = divmod(entry.user_data, 3)
+                results[slot][op] = self._result(entry)
+                liburing.io_uring_cqe_seen(ring, entry)
+            
+            # チェーンが途中で切れた場合はcloseがキャンセルされるため、スロットを個別に閉じる
+            leaked = [slot for slot, (open_res, _, close_res) in enumerate(results)
+                      if open_res >= 0 and close_res < 0]
+            for slot in leaked:
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_close_direct(sqe, slot)
+            if leaked:
+                liburing.io_uring_submit_and_wait(ring, len(leaked))
+                for _ in leaked:
+                    liburing.io_uring_wait_cqe(ring, self._cqe)
+                    liburing.io_uring_cqe_seen(ring, self._cqe[0])
+        
+        return [self._to_outcome(path, data, res) for (path, data), res in zip(batch, results)]
+    
+    @staticmethod
+    def _to_outcome(path: str, data: bytes, res: List[int]) -> Union[int, OSError]:
+        """1ファイル分の[open, write, close]の結果を、書き込みバイト数またはOSErrorに変換します。"""
+        open_res, write_res, _ = res
+        # 失敗した操作の結果（負のerrno）をOSErrorに変換
+        if open_res < 0:
+            return OSError(-open_res, os.strerror(-open_res), path)
+        if write_res < 0:
+            return OSError(-write_res, os.strerror(-write_res), path)
+        if write_res != len(data):
+            return IOError(f"ファイルへの書き込みが途中で終了しました（{write_res}/{len(data)}バイト）: {path}")
+        return write_res
+    
+    @staticmethod
+    def _result(entry) -> int:
+        """
+        CQEの結果を取得します。
+        
+        liburingは負の結果を読み取った時点で例外を送出するため、
+        ここでは負のerrnoに戻して呼び出し元でまとめて処理します。
+        """
+        try:
+            return entry.res
+        except OSError as e:
+            return -e.errno
+    
+    def close(self) -> None:
+        """リングを解放します。"""
+        with self._lock:
+            liburing.io_uring_queue_exit(self._ring)
+
+
+# io_uringライタのキャッシュ（None: 未初期化、False: 使用不可）
+# 再読み込みで作成済みのリングを失わないよう、既存のライタを引き継ぐ
+_uring_writer: Union[UringWriter, bool, None] = globals().get('_uring_writer')
+
+def _get_uring_writer() -> Optional[UringWriter]:
+    """
+    io_uringライタを取得します。初回呼び出し時に初期化を試みます。
+    
+    liburingがインストールされていない場合、カーネルが固定ファイルへの直接オープン
+    （Linux 5.15以降）をサポートしていない場合、またはリングの作成に失敗した場合は
+    Noneを返し、呼び出し元はos.open/os.writeによる通常の書き込みにフォールバックします。
+    
+    戻り値:
+        Optional[UringWriter]: 使用可能なライタ、または使用できない場合はNone
+    """
+    global _uring_writer
+    if _uring_writer is None:
+        _uring_writer = False
+        if liburing is not None and sys.platform.startswith('linux'):
+            try:
+                if not liburing.linux_version_check(5.15):
+                    _uring_writer = UringWriter(MAX_BATCH)
+                    logger.info("io_uringによる書き込みバックエンドを使用します")
+            except Exception as e:
+                logger.warning("io_uringを初期化できませんでした。標準の書き込みを使用します: %s", str(e))
+    return _uring_writer or None
+
+def _close_uring_writer() -> None:
+    """io_uringライタのリングを解放します。次に_get_uring_writerが呼ばれた場合は再度初期化されます。"""
+    global _uring_writer
+    if _uring_writer:
+        _uring_writer.close()
+    _uring_writer = None
+
+# 通常の書き込みで使用するフラグ（O_CLOEXECやO_BINARYがないプラットフォームでは0）
+_WRITE_FLAGS = (os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+                | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+
+def _write_file(filepath: str, data: bytes) -> int:
+    """
+    os.open/os.writeでバイト列をファイルに書き込みます（io_uringが使用できない場合のフォールバック）。
+    
+    データは既にエンコード済みのため、open()のテキスト層やバッファ層を経由せず、
+    ファイルディスクリプタに直接書き込みます。
+    
+    戻り値:
+        int: 書き込まれたバイト数
+    """
+    fd = os.open(filepath, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        written = 0
+        # os.writeは一部しか書き込まない場合があるため、全体が書き込まれるまで繰り返す
+        while written < len(view):
+            written += os.write(fd, view[written:])
+    finally:
+        os.close(fd)
+    return written
+
+# O_DIRECTによる書き込みが使用可能かどうか（保存先のファイルシステムが対応していなければFalseにする）
+_direct_io_supported = hasattr(os, 'O_DIRECT')
+
+def _write_file_direct(filepath: str, buf: mmap.mmap, size: int) -> int:
+    """
+    O_DIRECTでページキャッシュを経由せずにバッファの先頭sizeバイトをファイルに書き込みます。
+    
+    O_DIRECTではバッファのアドレスと書き込み長をアライメントに揃える必要があるため、
+    ページ境界に揃ったプールのバッファから_DIRECT_IO_ALIGNの倍数の長さを書き込み、
+    最後にftruncateで本来のサイズに切り詰めます。
+    
+    引数:
+        filepath: 書き込み先ファイルの絶対パス
+        buf: 書き込むデータを先頭に格納したバッファ（_acquire_bufferで取得したもの）
+        size: 書き込むバイト数
+        
+    戻り値:
+        int: 書き込まれたバイト数
+    """
+    aligned = _align_up(size, _DIRECT_IO_ALIGN)
+    # 切り詰められる末尾の余白に以前のデータが残らないよう0で埋める
+    buf[size:aligned] = bytes(aligned - size)
+    fd = os.open(filepath, _WRITE_FLAGS | os.O_DIRECT, 0o666)
+    try:
+        view = memoryview(buf)[:aligned]
+        written = 0
+        while written < aligned:
+            written += os.write(fd, view[written:])
+        os.ftruncate(fd, size)
+    finally:
+        os.close(fd)
+    return size
+
+def _write_large(filepath: str, data: memoryview) -> int:
+    """
+    大きなデータをO_DIRECTで書き込みます。
+    
+    保存先のファイルシステムがO_DIRECTに対応していない場合（EINVAL）は、以降のO_DIRECTを無効にして
+    通常の書き込みにフォールバックします。
+    """
+    global _direct_io_supported
+    try:
+        return _write_file_direct(filepath, data.obj, len(data))
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        logger.warning("O_DIRECTによる書き込みに失敗したため、通常の書き込みを使用します: %s", str(e))
+        _direct_io_supported = False
+        return _write_file(filepath, data)
+
+def _is_direct_io_candidate(data: bytes) -> bool:
+    """
+    O_DIRECTで書き込むべきデータかどうかを判定します。
+    
+    大きさが_DIRECT_IO_THRESHOLD以上で、プールのバッファ（ページ境界に揃ったmmap）の
+    先頭部分を指すmemoryviewである場合に限ります。小さなデータでは通常の書き込みの方が高速です。
+    """
+    return (_direct_io_supported and len(data) >= _DIRECT_IO_THRESHOLD
+            and isinstance(data, memoryview) and isinstance(data.obj, mmap.mmap))
+
+def _write_batch(batch: List[Tuple[str, bytes]]) -> List[Union[int, OSError]]:
+    """
+    複数のファイルをまとめて書き込みます。io_uringが使用可能な場合は1回の送信で処理します。
+    
+    1MB以上の大きなデータはO_DIRECTで個別に書き込み、それ以外をまとめて書き込みます。
+    まとめて書き込むファイルが_URING_MIN_BATCH件未満の場合は、io_uringを使用せずに
+    os.open/os.writeで書き込みます。
+    
+    引数:
+        batch: (書き込み先ファイルの絶対パス, 書き込むバイト列) のリスト
+        
+    戻り値:
+        List[Union[int, OSError]]: batchと同じ順序の、書き込まれたバイト数またはOSError
+    """
+    results: List[Union[int, OSError, None]] = [None] * len(batch)
+    small = []
+    for i, (filepath, data) in enumerate(batch):
+        if _is_direct_io_candidate(data):
+            try:
+                results[i] = _write_large(filepath, data)
+            except OSError as e:
+                results[i] = e
+        else:
+            small.append(i)
+    
+    # 単発の書き込みではリングへの送信と完了の取り出しのコストが、削減できるシステムコールより大きい
+    writer = _get_uring_writer() if len(small) >= _URING_MIN_BATCH else None
+    if writer is not None:
+        for i, result in zip(small, writer.write_batch([batch[i] for i in small])):
+            results[i] = result
+    else:
+        for i in small:
+            try:
+                results[i] = _write_file(*batch[i])
+            except OSError as e:
+                results[i] = e
+    return results
+
+def _align_up(size: int, alignment: int) -> int:
+    """sizeをalignmentの倍数に切り上げます。"""
+    return -(-size // alignment) * alignment
+
+# エンコード用バッファのプール - 大きなテキストのたびにbytesオブジェクトを確保しないよう再利用する
+_buffer_pool: "queue.SimpleQueue[mmap.mmap]" = globals().get('_buffer_pool') or queue.SimpleQueue()
+
+def _acquire_buffer() -> mmap.mmap:
+    """
+    プールからエンコード用バッファを取得します。空の場合は新しく確保します。
+    
+    バッファは匿名mmapで確保するため、先頭がページ境界に揃っており、O_DIRECTでそのまま書き込めます。
+    大きさはMAX_TEXT_SIZEを_DIRECT_IO_ALIGNの倍数に切り上げたもので、
+    実際に書き込まれたページだけが物理メモリを使用します。
+    """
+    try:
+        buf = _buffer_pool.get_nowait()
+    except queue.Empty:
+        _CACHE_STATS["buffer_pool_misses"] += 1
+        return mmap.mmap(-1, _align_up(MAX_TEXT_SIZE, _DIRECT_IO_ALIGN))
+    _CACHE_STATS["buffer_pool_hits"] += 1
+    return buf
+
+def _release_buffer(buf: mmap.mmap) -> None:
+    """使い終わったバッファをプールに戻します（プールが満杯の場合は破棄）。"""
+    if _buffer_pool.qsize() < _BUFFER_POOL_SIZE:
+        _buffer_pool.put(buf)
+
+def _encode_into(text: str, buf: mmap.mmap) -> int:
+    """
+    テキストをUTF-8でエンコードし、バッファの先頭から書き込みます。
+    
+    テキスト全体を一度にエンコードせず、_ENCODE_CHUNK文字ずつインクリメンタルエンコーダで
+    エンコードしてバッファにコピーするため、テキスト全体の大きさのbytesオブジェクトは作成されません。
+    
+    引数:
+        text: エンコードするテキスト
+        buf: 書き込み先のバッファ
+        
+    戻り値:
+        int: バッファに書き込まれたバイト数
+        
+    例外:
+        TextTooLargeError: エンコード後のサイズがMAX_TEXT_SIZEを超える場合
+    """
+    encoder = codecs.getincrementalencoder('utf-8')()
+    capacity = min(len(buf), MAX_TEXT_SIZE)
+    size = 0
+    for start in range(0, len(text), _ENCODE_CHUNK):
+        chunk = encoder.encode(text[start:start + _ENCODE_CHUNK])
+        end = size + len(chunk)
+        if end > capacity:
+            raise TextTooLargeError(f"テキストサイズが許容される最大値（{MAX_TEXT_SIZE}バイト）を超えています")
+        buf[size:end] = chunk
+        size = end
+    return size
+
+# 書き込み要求のキューと、それを処理するバックグラウンドタスク（イベントループごとに作成）
+# 再読み込みで実行中のタスクが終了の合図を受け取れなくならないよう、既存のものを引き継ぐ
+_write_queue: Optional["asyncio.Queue[Tuple[str, bytes, mmap.mmap, asyncio.Future]]"] = globals().get('_write_queue')
+_writer_task: Optional["asyncio.Task[None]"] = globals().get('_writer_task')
+
+async def _writer_loop(requests: "asyncio.Queue[Tuple[str, bytes, mmap.mmap, asyncio.Future]]") -> None:
+    """
+    書き込み要求をキューから取り出し、まとめて書き込むバックグラウンドタスク
+    
+    最初の要求を受け取った後、短い時間（_BATCH_WINDOW）だけ待機して同時に届いた要求を
+    最大MAX_BATCH件まで集め、1回の送信で書き込みます。結果は各要求のFutureに返し、
+    書き込みが終わったバッファをプールに戻します。
+    キューからNoneを受け取ると、それまでに届いた要求をすべて書き込んでから終了します。
+    """
+    stopping = False
+    while not stopping:
+        item = await requests.get()
+        if item is None:
+            return
+        pending = [item]
+        await asyncio.sleep(_BATCH_WINDOW)
+        while len(pending) < MAX_BATCH and not requests.empty():
+            item = requests.get_nowait()
+            if item is None:
+                stopping = True
+                break
+            pending.append(item)
+        
+        batch = [(filepath, data) for filepath, data, _, _ in pending]
+        try:
+            # 書き込みの完了待ちでイベントループをブロックしないよう、別スレッドで実行
+            results = await asyncio.to_thread(_write_batch, batch)
+        except Exception as e:
+            results = [e] * len(pending)
+        finally:
+            # 書き込みが終わるまでバッファは再利用できないため、プールに戻すのはここで行う
+            for _, _, buf, _ in pending:
+                _release_buffer(buf)
+        
+        for (_, _, _, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+async def _submit(filepath: str, data: bytes, buf: mmap.mmap) -> int:
+    """
+    書き込み要求をキューに追加し、書き込みの完了を待ちます。
+    
+    dataを格納したバッファの所有権はバックグラウンドタスクに移り、書き込みの完了後に
+    プールへ戻されます。呼び出し元が中断された場合でも、書き込み中のバッファが
+    別の要求に再利用されることはありません。
+    
+    引数:
+        filepath: 書き込み先ファイルの絶対パス
+        data: 書き込むバイト列（bufの先頭部分）
+        buf: dataを格納した、_acquire_bufferで取得したバッファ
+        
+    戻り値:
+        int: 書き込まれたバイト数
+        
+    例外:
+        OSError: ファイルへの書き込みに失敗した場合
+    """
+    global _write_queue, _writer_task
+    loop = asyncio.get_running_loop()
+    # バックグラウンドタスクが未起動、終了済み、または別のイベントループのものであれば作成し直す
+    if _writer_task is None or _writer_task.done() or _writer_task.get_loop() is not loop:
+        _write_queue = asyncio.Queue()
+        _writer_task = loop.create_task(_writer_loop(_write_queue))
+    future = loop.create_future()
+    _write_queue.put_nowait((filepath, data, buf, future))
+    return await future
+
+# タイムスタンプのキャッシュ - [UNIX時刻（秒）, 整形済み文字列, その秒に生成したファイル名の数]
+# 再読み込み直後に同じ秒の連番がリセットされてファイルを上書きしないよう、既存のキャッシュを引き継ぐ
+_TS_CACHE: List[Any] = globals().get('_TS_CACHE') or [0, "", 0]
+
+def _timestamp() -> str:
+    """
+    自動生成ファイル名用のタイムスタンプ文字列を返します。
+    
+    整形済みの文字列は秒単位でキャッシュし、同じ秒の間はdatetimeオブジェクトの作成と
+    strftimeによる整形を省略します。同じ秒に複数回呼び出された場合は、ファイル名が
+    重複しないよう2回目以降に連番を付けます（例: '2025-01-01-12-00-00-1'）。
+    
+    戻り値:
+        str: 'year-month-date-hour-minute-second' 形式（必要に応じて連番付き）の文字列
+    """
+    cache = _TS_CACHE
+    now = time.time_ns() // 1_000_000_000
+    if now != cache[0]:
+        cache[0] = now
+        cache[1] = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime(now))
+        cache[2] = 0
+        return cache[1]
+    cache[2] += 1
+    return f"{cache[1]}-{cache[2]}"
+
+async def _stop_writer() -> None:
+    """書き込みキューに残っている要求をすべて書き込んだ後、バックグラウンドタスクを終了します。"""
+    global _write_queue, _writer_task
+    task = _writer_task
+    if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+        _write_queue.put_nowait(None)
+        await task
+    _write_queue = None
+    _writer_task = None
+
+# _lifespanに入っているサーバーセッションの数（最後のセッションが終了したときに後始末する）
+# 再読み込みの前に開始したセッションも数に含めるため、既存の値を引き継ぐ
+_lifespan_users: int = globals().get('_lifespan_users', 0)
+
+@asynccontextmanager
+async def _lifespan(app: FastMCP) -> AsyncIterator[None]:
+    """
+    MCPサーバーの起動時に一度だけ行う初期化と、終了時の後始末を行います。
+    
+    保存ディレクトリの作成とio_uringライタの初期化を起動時に済ませておくことで、
+    保存のたびに初期化の確認やmkdirを行う必要がなくなります。終了時には書き込みキューを
+    空にしてからリングを解放します。ライタは書き込みキューのバックグラウンドタスクが
+    _get_uring_writerで取得するため、ライフスパンコンテキストとしては公開しません。
+    
+    引数:
+        app: 起動するFastMCPサーバー
+    """
+    global _lifespan_users
+    _ensure_save_dir()
+    _get_uring_writer()
+    _lifespan_users += 1
+    try:
+        yield
+    finally:
+        _lifespan_users -= 1
+        if _lifespan_users == 0:
+            # キャンセルによる終了でも、キューに残った書き込みを完了させてからリングを解放する
+            with anyio.CancelScope(shield=True):
+                try:
+                    await _stop_writer()
+                finally:
+                    _close_uring_writer()
+
 # MCPサーバーインスタンスの作成
 # FastMCPはmcpライブラリによって提供されるクラスで、MCPサーバーを簡単に作成するためのものです
-mcp = FastMCP(
-    name="text-saver",     # このMCPサーバーの名前
-    host="127.0.0.1",      # ローカルホストにバインド（外部からのアクセスを防止）
-    port=8080,             # リッスンするポート番号
-    timeout=30             # タイムアウト秒数（リクエスト処理の最大待機時間）
-)
+# 作成済みのインスタンスは(名前, ホスト, ポート)ごとにキャッシュし、再読み込み時は再利用する
+_MCP_CACHE: Dict[Tuple[str, str, int], FastMCP] = globals().get('_MCP_CACHE') or {}
+_MCP_KEY = ("text-saver", "127.0.0.1", 8080)
+mcp = _MCP_CACHE.get(_MCP_KEY)
+_MCP_CACHE_HIT = mcp is not None  # キャッシュ済みのインスタンスを再利用したかどうか
+if not _MCP_CACHE_HIT:
+    mcp = _MCP_CACHE[_MCP_KEY] = FastMCP(
+        name=_MCP_KEY[0],      # このMCPサーバーの名前
+        host=_MCP_KEY[1],      # ローカルホストにバインド（外部からのアクセスを防止）
+        port=_MCP_KEY[2],      # リッスンするポート番号
+        timeout=30,            # タイムアウト秒数（リクエスト処理の最大待機時間）
+        lifespan=_lifespan     # 起動時の初期化と終了時の後始末
+    )
+else:
+    _CACHE_STATS["mcp_instance_hits"] += 1
+
+def _register_tool(fn):
+    """
+    関数をMCPツールとして登録するデコレータです（mcp.tool()の代わりに使用します）。
+    
+    キャッシュ済みのインスタンスを再利用した場合（再読み込み時）は、ツールは最初の読み込みで
+    登録済みのため、登録を行わずに関数をそのまま返します。登録済みのツールは最初に読み込んだ
+    関数を呼び出し続けますが、内部で使用するヘルパー（_store_textなど）はモジュールの
+    グローバル変数から参照されるため、再読み込み後の実装が使われます。ツールの引数や
+    説明文の変更を反映するにはサーバーの再起動が必要です。
+    """
+    if _MCP_CACHE_HIT:
+        return fn
+    return mcp.tool()(fn)
+
+async def _store_text(text: str, filename: str) -> Dict[str, Any]:
+    """
+    テキストをエンコードし、保存ディレクトリ内のファイルに書き込みます。
+    
+    save_textとsave_text_autoで共通の処理です。ファイル名は呼び出し元で
+    生成または検証済みで、.txt拡張子が付いている必要があります。
+    
+    引数:
+        text: ファイルに保存するテキストコンテンツ
+        filename: 検証済みのファイル名
+    
+    戻り値:
+        保存されたファイルへのパスを含む成功レスポンス、または書き込みエラーのレスポンス
+        
+    例外:
+        TextTooLargeError: テキストが許容される最大サイズを超える場合
+    """
+    # 保存ディレクトリはサーバーの起動時（_lifespan）に作成済み
+    # 許可されたディレクトリ内の完全なパスを作成
+    # _SAVE_DIR_STRは絶対パスのため、結果もそのまま絶対パスになる
+    filepath = _SAVE_DIR_STR + os.sep + filename
+    
+    # テキストサイズの確認 - 許容される最大サイズを超えていないか
+    # UTF-8では1文字が1バイト以上になるため、文字数が上限を超えていればエンコードせずに拒否できる
+    # （大半を占めるASCIIのみのテキストでは、文字数がそのままエンコード後のバイト数になる）
+    if len(text) > MAX_TEXT_SIZE:
+        raise TextTooLargeError(f"テキストサイズが許容される最大値（{MAX_TEXT_SIZE}バイト）を超えています")
+    
+    # 安価な入力の検証とファイル名の処理を先に済ませ、最もコストの高いエンコードは最後に行う
+    # UTF-8エンコードは一度だけ、プールから取得したバッファに対して行い、
+    # 同じバイト列をサイズ確認と書き込みの両方に使用する
+    # （非ASCIIのテキストがエンコード後に上限を超えた場合は、エンコード中に例外が発生する）
+    buf = _acquire_buffer()
+    try:
+        data = memoryview(buf)[:_encode_into(text, buf)]
+    except BaseException:
+        # 書き込みキューに渡す前に失敗した場合は、ここでバッファをプールに戻す
+        _release_buffer(buf)
+        raise
+    
+    # 操作をログに記録 - デバッグと監査のため
+    # %形式で渡すことで、DEBUGが無効な場合はメッセージの整形自体が行われない
+    logger.debug("保存先: %s", filepath)
+    
+    # テキストをファイルに保存
+    try:
+        # エンコード済みのバイト列を書き込みキューに渡す
+        # 同時に届いた他の保存要求とまとめて、1回の送信で書き込まれる
+        # バッファは書き込みの完了後にバックグラウンドタスクがプールに戻す
+        await _submit(filepath, data, buf)
+    except PermissionError:
+        # 書き込み権限がない場合のエラーハンドリング
+        return {"status": "error", "message": f"ファイルへの書き込み権限がありません: {filename}"}
+    except IOError as e:
+        # その他のI/Oエラーのハンドリング
+        return {"status": "error", "message": f"ファイルへの書き込み中にIOエラーが発生しました: {str(e)}"}
+    
+    # ユーザーフィードバックのための絶対パス（filepathは既に絶対パス）
+    abs_path = filepath
+    
+    # 書き込みが例外なく完了した時点でファイルは存在するため、stat による再確認は行わない
+    # ファイルサイズは書き込んだバイト列の長さをそのまま使用する
+    file_size = len(data)
+    
+    # 成功レスポンスを返す
+    return {
+        "status": "success", 
+        "message": f"テキストをファイルに正常に保存しました: {abs_path}",
+        "path": abs_path,  # 保存されたファイルの絶対パス
+        "size": file_size, # ファイルサイズ（バイト）
+        "filename": filename  # 使用されたファイル名
+    }
 
 # MCPツールの定義
-# @mcp.tool()デコレータは、この関数をMCPツールとして登録します
+# @_register_toolデコレータは、この関数をMCPツールとして登録します
 # Claudeはこの関数を、テキストをファイルに保存するためのツールとして呼び出すことができます
-@mcp.tool()
-def save_text(text: str, filename: Optional[str] = None) -> Union[str, Dict[str, Any]]:
+@_register_tool
+async def save_text(text: str, filename: Optional[str] = None) -> Union[str, Dict[str, Any]]:
     """
     セキュリティとエラー処理を備えたテキストをファイルに保存します。
     
@@ -143,7 +803,7 @@ def save_text(text: str, filename: Optional[str] = None) -> Union[str, Dict[str,
         text: ファイルに保存するテキストコンテンツ
         filename: オプションのファイル名。指定されていない場合は、
                  'year-month-date-hour-minute-second.txt'
-                 形式のタイムスタンプを使用します
+                 形式のタイムスタンプを使用します（同じ秒に複数回保存した場合は連番付き）
     
     戻り値:
         保存されたファイルへのパスを含む成功メッセージ、またはエラーメッセージ
@@ -158,19 +818,16 @@ def save_text(text: str, filename: Optional[str] = None) -> Union[str, Dict[str,
         if not isinstance(text, str):
             return {"status": "error", "message": "エラー: テキストは文字列である必要があります"}
             
-        # テキストサイズの確認 - 許容される最大サイズを超えていないか
-        # UTF-8エンコードされたサイズをバイト単位で確認
-        if len(text.encode('utf-8')) > MAX_TEXT_SIZE:
-            raise TextTooLargeError(f"テキストサイズが許容される最大値（{MAX_TEXT_SIZE}バイト）を超えています")
-            
         # ファイル名の生成または検証
         if not filename:
             # ファイル名が指定されていない場合、現在の日時に基づいたタイムスタンプファイル名を生成
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-            filename = timestamp + ".txt"
+            filename = _timestamp() + ".txt"
         else:
             # ファイル名が提供されている場合、安全性を検証
-            if not validate_filename(filename):
+            # ほとんどの呼び出しは"notes.txt"のような安全なファイル名を渡すため、検証に通ればサニタイズを省略する
+            if validate_filename(filename):
+                _CACHE_STATS["plain_filename_hits"] += 1
+            else:
                 logger.warning("安全でないファイル名が試行されました: %s", filename)
                 # 安全でないファイル名をサニタイズ
                 filename = sanitize_path(filename)
@@ -180,48 +837,7 @@ def save_text(text: str, filename: Optional[str] = None) -> Union[str, Dict[str,
         if not filename.endswith('.txt'):
             filename += '.txt'
         
-        # 保存ディレクトリが存在しない場合は作成
-        Path(ALLOWED_SAVE_DIR).mkdir(parents=True, exist_ok=True)
-        
-        # 許可されたディレクトリ内の完全なパスを作成
-        filepath = os.path.join(ALLOWED_SAVE_DIR, filename)
-        
-        # 操作をログに記録 - デバッグと監査のため
-        logger.info(f"現在の作業ディレクトリ: {os.getcwd()}")
-        logger.info(f"スクリプトディレクトリ: {os.path.dirname(os.path.abspath(__file__))}")
-        logger.info(f"保存先: {filepath}")
-        
-        # テキストをファイルに保存
-        try:
-            with open(filepath, 'w', encoding='utf-8') as file:
-                file.write(text)
-        except PermissionError:
-            # 書き込み権限がない場合のエラーハンドリング
-            return {"status": "error", "message": f"ファイルへの書き込み権限がありません: {filename}"}
-        except IOError as e:
-            # その他のI/Oエラーのハンドリング
-            return {"status": "error", "message": f"ファイルへの書き込み中にIOエラーが発生しました: {str(e)}"}
-        
-        # ユーザーフィードバックのために絶対パスを取得
-        abs_path = os.path.abspath(filepath)
-        
-        # 検証: ファイルが正常に書き込まれたかチェック
-        if not os.path.exists(filepath):
-            return {"status": "error", "message": f"ファイルが正常に作成されませんでした: {abs_path}"}
-            
-        # 検証: ファイルサイズの確認
-        file_size = os.path.getsize(filepath)
-        if file_size == 0 and len(text) > 0:
-            return {"status": "error", "message": f"ファイルは作成されましたが、空のようです: {abs_path}"}
-        
-        # 成功レスポンスを返す
-        return {
-            "status": "success", 
-            "message": f"テキストをファイルに正常に保存しました: {abs_path}",
-            "path": abs_path,  # 保存されたファイルの絶対パス
-            "size": file_size, # ファイルサイズ（バイト）
-            "filename": filename  # 使用されたファイル名
-        }
+        return await _store_text(text, filename)
         
     except TextTooLargeError as e:
         # テキストサイズに関するエラーのハンドリング
@@ -236,6 +852,57 @@ def save_text(text: str, filename: Optional[str] = None) -> Union[str, Dict[str,
         logger.exception("テキスト保存中に予期しないエラーが発生しました: %s", str(e))
         return {"status": "error", "message": f"予期しないエラー: {str(e)}"}
 
+@_register_tool
+async def save_text_auto(text: str) -> Dict[str, Any]:
+    """
+    テキストをタイムスタンプ付きのファイル名で保存します。
+    
+    ファイル名を指定しない保存のための専用ツールです。ファイル名の検証や
+    サニタイズ、拡張子の確認を行わず、タイムスタンプから生成したファイル名で直接書き込みます。
+    
+    引数:
+        text: ファイルに保存するテキストコンテンツ
+    
+    戻り値:
+        保存されたファイルへのパスを含む成功メッセージ、またはエラーメッセージ
+        （ファイル名は'year-month-date-hour-minute-second.txt'形式、同じ秒に複数回保存した場合は連番付き）
+    """
+    try:
+        # 入力を検証 - textパラメータが文字列であることを確認
+        if not isinstance(text, str):
+            return {"status": "error", "message": "エラー: テキストは文字列である必要があります"}
+        return await _store_text(text, _timestamp() + ".txt")
+    except TextTooLargeError as e:
+        # テキストサイズに関するエラーのハンドリング
+        logger.error("テキストサイズエラー: %s", str(e))
+        return {"status": "error", "message": str(e)}
+    except Exception as e:
+        # 予期しないエラーのキャッチオール - 常に安全にエラーを処理
+        logger.exception("テキスト保存中に予期しないエラーが発生しました: %s", str(e))
+        return {"status": "error", "message": f"予期しないエラー: {str(e)}"}
+
+@_register_tool
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    キャッシュの利用状況を返します。
+    
+    保存処理で再利用されているキャッシュ（FastMCPインスタンス、エンコード用バッファのプール、
+    サニタイズが不要だったファイル名の数、io_uringライタ）がどの程度効果を上げているかを確認するためのツールです。
+    
+    戻り値:
+        各キャッシュのヒット数と現在の状態を含む辞書
+    """
+    return {
+        "status": "success",
+        **_CACHE_STATS,
+        "buffer_pool_size": _buffer_pool.qsize(),  # プールに待機中のバッファ数
+        "uring_enabled": bool(_uring_writer),  # io_uringライタを使用中かどうか
+        "pid": os.getpid(),  # 統計を記録しているプロセス
+    }
+
+# 初期化済みのプロセスを記録 - 再読み込み時に一度きりの初期化を繰り返さないため
+_INITIALIZED = os.getpid()
+
 def main() -> None:
     """
     MCPサーバーのメインエントリーポイント
@@ -247,12 +914,12 @@ def main() -> None:
         # サーバー起動のログ出力
         logger.info("TextSaver MCPサーバー 'text-saver' を 127.0.0.1:8080 で起動しています")
         logger.info("ファイルの保存先ディレクトリ: %s", ALLOWED_SAVE_DIR)
+        # 作業ディレクトリとスクリプトディレクトリは実行中に変わらないため、起動時に一度だけ記録
+        logger.info("現在の作業ディレクトリ: %s", _CWD)
+        logger.info("スクリプトディレクトリ: %s", SCRIPT_DIR)
         logger.info("最大許容ファイルサイズ: %d バイト", MAX_TEXT_SIZE)
         
-        # 保存ディレクトリが存在することを確認
-        Path(ALLOWED_SAVE_DIR).mkdir(parents=True, exist_ok=True)
-        
-        # MCPサーバーの実行
+        # MCPサーバーの実行（保存ディレクトリの作成などは_lifespanで起動時に行われる）
         # transport='stdio'パラメータは、サーバーが標準入出力を使用してClaudeと通信することを指定
         # これにより、Claude Desktopアプリはこのプロセスと通信できる
         mcp.run(transport='stdio')